@@ -0,0 +1,213 @@
+"""
+Tom Basso Coin Toss - Shared Core
+=================================
+One copy of the data loading, indicators, coin flips and backtest engines
+used by all three scripts:
+
+• tom_basso_simplified_v2.py               → backtest_simple (random $100 trades)
+• tom_basso_simplified_with_trailing_stop.py → backtest_trailing + Monte-Carlo
+• tom_basso_simplified_with_plot.py         → backtest_trailing + 4-panel figure
+
+Numba is optional: with it the trailing-stop loop is JIT-compiled once
+(cached on disk, shared by every script) and Monte-Carlo runs in parallel;
+without it the same code runs as plain Python / NumPy. The Numba kernels live
+in basso_jit.py and are only imported by the trailing-stop functions, so
+backtest_simple never loads Numba.
+"""
+
+import pandas as pd
+import numpy as np
+import os
+import tempfile
+
+# FIXED FILE PATH - Works from any directory
+SPY_CSV = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                       'SPY_1D_BID_16.02.2017-06.07.2024.csv')
+
+# REPRODUCIBLE COIN FLIPS - seed for each script's generator (override: BASSO_SEED=<int>)
+SEED = int(os.environ.get('BASSO_SEED', 42))
+
+# =============================================================================
+# DATA + INDICATORS
+# =============================================================================
+
+def load_spy(file_path=SPY_CSV):
+    """Load candlestick CSV with European date format (dd.mm.yyyy)."""
+    cache_path = file_path + '.parquet'  # Parsed-frame cache, rebuilt when the CSV is newer
+    try:
+        if os.path.exists(cache_path) and os.path.getmtime(cache_path) >= os.path.getmtime(file_path):
+            return pd.read_parquet(cache_path)
+    except Exception:  # No parquet engine or unreadable/corrupt cache - reparse and rebuild
+        pass
+    df = pd.read_csv(file_path)
+    df['Gmt time'] = pd.to_datetime(df['Gmt time'], format='%d.%m.%Y %H:%M:%S.%f')
+    df = df[df.High != df.Low]
+    df.set_index("Gmt time", inplace=True)
+    # Unique temp file + atomic replace - concurrent or interrupted runs never leave a bad cache
+    tmp_path = None
+    try:
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(cache_path) or '.', suffix='.parquet')
+        os.close(fd)
+        df.to_parquet(tmp_path)
+        os.replace(tmp_path, cache_path)
+    except Exception:  # Caching is best-effort only
+        if tmp_path and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return df
+
+def add_atr(df, length=10):
+    """Wilder ATR for Basso's 3x volatility stops."""
+    high = df['High'].to_numpy(dtype=np.float64)
+    low = df['Low'].to_numpy(dtype=np.float64)
+    prev_close = np.empty(len(df))
+    prev_close[0] = np.nan
+    prev_close[1:] = df['Close'].to_numpy(dtype=np.float64)[:-1]
+    tr = high - low
+    np.fmax(tr, np.abs(high - prev_close), out=tr)  # fmax skips the NaN on the first bar
+    np.fmax(tr, np.abs(low - prev_close), out=tr)
+    tr = pd.Series(tr, index=df.index)
+    df['ATR'] = tr.ewm(alpha=1.0 / length, min_periods=length, adjust=False).mean()  # Wilder
+    return df
+
+def make_signals(df, rng):
+    """COIN FLIP: 50/50 Long/Buy(2) / Short/Sell(1) on every candle, drawn from rng."""
+    df['TotalSignal'] = rng.integers(1, 3, size=len(df), dtype=np.int8)
+    return df
+
+# =============================================================================
+# RANDOM $100 BACKTEST (NO STOPS)
+# =============================================================================
+
+def backtest_simple(df, initial_capital=10000):
+    """Original random strategy: buy $100 on 2, sell on 1. Returns (equity, trades, avg PnL)."""
+    equity = initial_capital
+    position = 0
+    entry_price = 0
+    trades = np.empty(len(df), dtype=np.float64)  # Preallocated, at most one close per bar
+    n_trades = 0
+    close_arr = df['Close'].to_numpy(dtype=np.float64)
+    sig_arr = df['TotalSignal'].to_numpy(dtype=np.int8)
+
+    for i in range(len(df)):
+        price = close_arr[i]
+        signal = sig_arr[i]
+
+        if position == 0:  # FLAT - only a buy can act, skip the rest of the bar
+            if signal == 2:  # BUY
+                position = 100 / price  # $100 position size
+                entry_price = price
+            continue
+
+        if signal == 1:  # SELL
+            pnl = position * (price - entry_price)
+            equity += pnl
+            trades[n_trades] = pnl
+            n_trades += 1
+            position = 0
+
+    return equity, n_trades, trades[:n_trades].mean() if n_trades else 0
+
+# =============================================================================
+# TOM BASSO COIN TOSS BACKTEST (TRAILING STOPS)
+# =============================================================================
+
+def backtest_trailing(df, initial_capital=10000, risk_pct=0.01, atr_mult=3.0):
+    """
+    EXACT Tom Basso Coin Toss Experiment:
+    • Coin flip entry (random 1/2 signals)
+    • 1% equity risk per trade
+    • 3x ATR TRAILING stop from CLOSE
+    • Single market (SPY)
+    Returns (equity_curve, trades): n_bars + 1 equities, one PnL per closed trade.
+    """
+    from basso_jit import _basso_loop  # Lazy - only trailing-stop callers load Numba
+
+    # Column views are already contiguous; ascontiguousarray only copies if they ever aren't
+    close_arr = np.ascontiguousarray(df['Close'].to_numpy(dtype=np.float64))
+    atr_arr = np.ascontiguousarray(df['ATR'].to_numpy(dtype=np.float64))
+    sig_arr = np.ascontiguousarray(df['TotalSignal'].to_numpy(dtype=np.int8))
+    return _basso_loop(close_arr, atr_arr, sig_arr, float(initial_capital), risk_pct, atr_mult)
+
+# =============================================================================
+# MONTE-CARLO (Basso's claim is statistical - many coin flip universes)
+# =============================================================================
+
+def _sim_signals(rng, n_sims, n_bars):
+    """
+    Coin flips for n_sims runs, packed 1 bit per bar (1=LONG, 0=SHORT):
+    (n_sims, ceil(n_bars/8)) uint8. Row s comes from the s-th rng.spawn()
+    child - independent, reproducible streams shared by both Monte-Carlo engines.
+    """
+    packed = np.empty((n_sims, (n_bars + 7) // 8), dtype=np.uint8)
+    for s, child in enumerate(rng.spawn(n_sims)):
+        packed[s] = child.integers(0, 256, size=packed.shape[1], dtype=np.uint8)
+    return packed
+
+def monte_carlo_batch(df, rng, n_sims=1000, initial_capital=10000, risk_pct=0.01, atr_mult=3.0):
+    """
+    Monte-Carlo Basso: n_sims independent coin-toss runs in ONE pass.
+    • Coin flips packed 1 bit per bar: (n_sims, ceil(n_bars/8)) uint8
+    • Same per-sim flips as monte_carlo_parallel - same seed, same curves
+    • Per-sim state vectors (position, entry, trail stop, equity)
+    • Same rules as backtest_trailing, all sims updated per bar
+    Returns (n_sims, n_bars + 1) equity curves.
+    """
+    close_arr = df['Close'].to_numpy(dtype=np.float64)
+    stop_distances = atr_mult * df['ATR'].to_numpy(dtype=np.float64)  # 3x ATR, once for all bars
+    n_bars = len(close_arr)
+
+    packed = _sim_signals(rng, n_sims, n_bars)
+
+    equity = np.full(n_sims, float(initial_capital))
+    position = np.zeros(n_sims)  # Shares (+long, -short)
+    entry_price = np.zeros(n_sims)
+    trail_stop = np.zeros(n_sims)
+    equity_curves = np.empty((n_sims, n_bars + 1), dtype=np.float64)
+    equity_curves[:, 0] = equity
+
+    for i in range(n_bars):
+        price = close_arr[i]
+        stop_distance = stop_distances[i]
+        coin = (packed[:, i >> 3] >> (i & 7)) & 1
+
+        # COIN FLIP ENTRIES (all sims at once)
+        new_long = (coin == 1) & (position <= 0)
+        new_short = (coin == 0) & (position >= 0)
+        position_size = risk_pct * equity / stop_distance
+        position = np.where(new_long, position_size, np.where(new_short, -position_size, position))
+        new_entry = new_long | new_short
+        entry_price = np.where(new_entry, price, entry_price)
+
+        # TRAILING STOPS (sign=+1 LONG, -1 SHORT, 0 FLAT)
+        sign = np.sign(position)
+        new_trail = price - sign * stop_distance  # Initial stop on entry AND trail candidate
+        trail_stop = np.where(new_entry, new_trail, trail_stop)
+        trail_stop = sign * np.maximum(sign * trail_stop, sign * new_trail)
+        hit = (sign != 0) & (sign * (trail_stop - price) >= 0)
+        equity += np.where(hit, position * (price - entry_price), 0.0)
+        position = np.where(hit, 0.0, position)
+
+        equity_curves[:, i + 1] = equity
+
+    return equity_curves
+
+def monte_carlo(df, rng, n_sims=1000, initial_capital=10000, risk_pct=0.01, atr_mult=3.0):
+    """Parallel Numba kernel when Numba is available, vectorized NumPy batch otherwise."""
+    import basso_jit
+    engine = basso_jit.monte_carlo_parallel if basso_jit.HAVE_NUMBA else monte_carlo_batch
+    return engine(df, rng, n_sims, initial_capital, risk_pct, atr_mult)
+
+# =============================================================================
+# SELF-CHECK: python basso_core.py
+# =============================================================================
+
+if __name__ == '__main__':
+    from basso_jit import HAVE_NUMBA, monte_carlo_parallel
+
+    # Both Monte-Carlo engines must give identical curves for the same seed
+    df = add_atr(load_spy())
+    df = df.loc[df['ATR'].first_valid_index():]
+    batch = monte_carlo_batch(df, np.random.default_rng(SEED), n_sims=200)
+    parallel = monte_carlo_parallel(df, np.random.default_rng(SEED), n_sims=200)
+    assert np.allclose(batch, parallel), "Monte-Carlo engines disagree for the same seed"
+    print(f"✅ Monte-Carlo batch == parallel (seed {SEED}, 200 sims, Numba: {HAVE_NUMBA})")
@@ -0,0 +1,104 @@
+"""
+Tom Basso Coin Toss - Numba Kernels
+===================================
+The compiled trailing-stop loop and the parallel Monte-Carlo engine.
+
+Kept out of basso_core.py so only the trailing-stop code pays for importing
+Numba: basso_core imports this module lazily, on the first backtest_trailing()
+or monte_carlo() call. Without Numba the same code runs as plain Python.
+"""
+
+import numpy as np
+
+from basso_core import _sim_signals
+
+try:
+    from numba import njit, prange
+    HAVE_NUMBA = True
+except ImportError:  # Numba is optional - fall back to plain Python loops
+    HAVE_NUMBA = False
+    prange = range
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+# Explicit signature -> compiled eagerly at import (and cached), no first-call JIT stall.
+# Inputs are C-contiguous so Numba can use unit-stride loads, and typed readonly so
+# pandas copy-on-write arrays (and writable ones) both match.
+@njit("Tuple((float64[:], float64[:]))("
+      "Array(float64, 1, 'C', readonly=True), Array(float64, 1, 'C', readonly=True), "
+      "Array(int8, 1, 'C', readonly=True), float64, float64, float64)",
+      cache=True, fastmath=True)
+def _basso_loop(close, atr, sig, initial_capital, risk_pct, atr_mult):
+    """Compiled bar loop: returns (equity_curve, trades) as float64 arrays."""
+    n_bars = close.shape[0]
+    equity_curve = np.empty(n_bars + 1, dtype=np.float64)
+    trades = np.empty(n_bars, dtype=np.float64)
+    n_trades = 0
+    equity = initial_capital
+    position = 0.0  # Shares (+long, -short)
+    entry_price = 0.0
+    trail_stop = 0.0
+    equity_curve[0] = equity
+
+    for i in range(n_bars):
+        price = close[i]  # Basso uses CLOSE
+        stop_distance = atr_mult * atr[i]  # 3x ATR, reused for entry + trail
+        signal = sig[i]
+        risk_amount = risk_pct * equity  # Dynamic 1%
+
+        # COIN FLIP LONG (signal=2)
+        if signal == 2 and position <= 0:
+            position = risk_amount / stop_distance
+            entry_price = price
+            trail_stop = price - stop_distance  # Initial 3x ATR
+
+        # COIN FLIP SHORT (signal=1)
+        elif signal == 1 and position >= 0:
+            position = -risk_amount / stop_distance
+            entry_price = price
+            trail_stop = price + stop_distance  # Initial 3x ATR
+
+        # TRAILING STOP LOGIC (Basso's edge) - one branchless path for both sides
+        sign = 1.0 if position > 0 else (-1.0 if position < 0 else 0.0)
+        # Long: max(stop, Close - 3xATR) ONLY moves UP; short: mirrored, ONLY moves DOWN
+        trail_stop = sign * max(sign * trail_stop, sign * (price - sign * stop_distance))
+        if sign != 0.0 and sign * (trail_stop - price) >= 0.0:  # Stop hit
+            pnl = position * (price - entry_price)
+            equity += pnl
+            trades[n_trades] = pnl
+            n_trades += 1
+            position = 0.0
+
+        equity_curve[i + 1] = equity
+
+    return equity_curve, trades[:n_trades]
+
+@njit(parallel=True, cache=True, fastmath=True)
+def _basso_parallel(close, atr, packed, initial_capital, risk_pct, atr_mult):
+    """One coin toss universe per prange iteration, flips unpacked from its row of packed."""
+    n_sims = packed.shape[0]
+    n_bars = close.shape[0]
+    equity_curves = np.empty((n_sims, n_bars + 1), dtype=np.float64)
+
+    for s in prange(n_sims):
+        sig = np.empty(n_bars, dtype=np.int8)
+        for i in range(n_bars):
+            sig[i] = 1 + ((packed[s, i >> 3] >> (i & 7)) & 1)  # Bit 1=LONG(2), 0=SHORT(1)
+        equity_curve, _ = _basso_loop(close, atr, sig, initial_capital, risk_pct, atr_mult)
+        equity_curves[s, :] = equity_curve
+
+    return equity_curves
+
+def monte_carlo_parallel(df, rng, n_sims=1000, initial_capital=10000, risk_pct=0.01, atr_mult=3.0):
+    """
+    Monte-Carlo Basso across CPU cores (Numba prange):
+    • Sims are independent - one per thread, zero communication
+    • Per-sim flips from rng.spawn() children - independent, reproducible streams
+    Returns (n_sims, n_bars + 1) equity curves.
+    """
+    close_arr = np.ascontiguousarray(df['Close'].to_numpy(dtype=np.float64))
+    atr_arr = np.ascontiguousarray(df['ATR'].to_numpy(dtype=np.float64))
+    packed = _sim_signals(rng, n_sims, len(close_arr))
+    return _basso_parallel(close_arr, atr_arr, packed, float(initial_capital), risk_pct, atr_mult)
@@ -28,7 +28,7 @@ Drawdown: Controlled (1% risk max per trade)
 
 Code Features
 -------------
-• Pure random np.random.choice([1,2]) signals (coin flips)
+• Pure random rng.integers(1, 3) signals (coin flips)
 • Dynamic 1% equity risk (shrinks/grows with account)
 • 3x ATR trailing stops from daily CLOSE prices
 • Professional 4-panel visualization (equity curve + tables)
@@ -47,6 +47,8 @@ Usage
 1. Place SPY_1D_BID_16.02.2017-06.07.2024.csv in same folder
 2. Run script → Generates 'basso_coin_toss_results.png'
 3. Compare Coin Toss vs Buy & Hold → Risk management validated!
+4. Monte-Carlo: --sims 1000 → return distribution only, no figure
+   (--no-plot skips the figure for a single run)
 
 Expected Output
 ---------------
@@ -56,6 +58,7 @@ Buy & Hold SPY: +132% | Alpha: -130% (random baseline)
 Dependencies
 ------------
 pandas, numpy, matplotlib (pip install matplotlib)
+numba (optional - JIT-compiles the backtest loop)
 
 References
 ----------
@@ -74,189 +77,151 @@ Tom Basso COIN TOSS EXPERIMENT - COMPLETE w/ TABLE VISUALIZATION
 """
 
 
-import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import os
+import argparse
 
-# FIXED FILE PATH
-script_dir = os.path.dirname(os.path.abspath(__file__))
-file_path = os.path.join(script_dir, 'SPY_1D_BID_16.02.2017-06.07.2024.csv')
-print(f"🔍 Looking for file: {file_path}")
+from basso_core import SEED, SPY_CSV, load_spy, add_atr, make_signals, backtest_trailing, monte_carlo
 
-# =============================================================================
-# CORE FUNCTIONS
-# =============================================================================
-
-def read_csv_to_dataframe(file_path):
-    df = pd.read_csv(file_path)
-    df["Gmt time"] = df["Gmt time"].str.replace(".000", "")
-    df['Gmt time'] = pd.to_datetime(df['Gmt time'], format='%d.%m.%Y %H:%M:%S', dayfirst=True)
-    df = df[df.High != df.Low]
-    df.set_index("Gmt time", inplace=True)
-    return df
+file_path = SPY_CSV
+rng = np.random.default_rng(SEED)  # Reproducible coin flips (override: BASSO_SEED=<int>)
 
-def total_signal(df, current_candle):
-    return np.random.choice([1, 2])  # Coin flip
-
-def add_total_signal(df):
-    df['TotalSignal'] = [total_signal(df, idx) for idx in df.index]
-    return df
-
-def add_atr(df, length=10):
-    high_low = df['High'] - df['Low']
-    high_close = np.abs(df['High'] - df['Close'].shift())
-    low_close = np.abs(df['Low'] - df['Close'].shift())
-    tr = np.maximum(high_low, np.maximum(high_close, low_close))
-    df['ATR'] = tr.rolling(window=length).mean()
-    return df
+# Coin flip labels indexed by TotalSignal (1=SHORT, 2=LONG)
+SIGNAL_LABELS = np.array(['', '🔴SHORT', '🟢LONG'])
 
 # =============================================================================
-# TOM BASSO COIN TOSS ENGINE
+# BACKTEST (PURE COMPUTE - NO PLOTTING)
 # =============================================================================
 
-def run_tom_basso_coin_toss(df, initial_capital=10000, risk_pct=0.01, atr_mult=3.0):
-    equity = initial_capital
-    position = 0
-    entry_price = 0
-    trail_stop = 0
-    equity_curve = [initial_capital]
-    trades = []
+def backtest(df, initial_capital=10000, risk_pct=0.01, atr_mult=3.0):
+    """Run one coin toss backtest on df (ATR + TotalSignal added) and collect its metrics."""
+    equity_curve, trades = backtest_trailing(df, initial_capital, risk_pct, atr_mult)
+    close_arr = df['Close'].to_numpy()
+    buys = int(np.count_nonzero(df['TotalSignal'].to_numpy() == 2))
     
-    for i in range(len(df)):
-        price = df['Close'].iloc[i]
-        atr = df['ATR'].iloc[i]
-        signal = df['TotalSignal'].iloc[i]
-        risk_amount = risk_pct * equity
-        
-        # NEW LONG (coin=2)
-        if signal == 2 and position <= 0:
-            stop_distance = atr_mult * atr
-            position_size = risk_amount / stop_distance
-            position = position_size
-            entry_price = price
-            trail_stop = price - stop_distance
-            
-        # NEW SHORT (coin=1)
-        elif signal == 1 and position >= 0:
-            stop_distance = atr_mult * atr
-            position_size = risk_amount / stop_distance
-            position = -position_size
-            entry_price = price
-            trail_stop = price + stop_distance
-        
-        # TRAILING STOPS
-        if position > 0:  # LONG
-            new_trail = price - (atr_mult * atr)
-            trail_stop = max(trail_stop, new_trail)
-            if price <= trail_stop:
-                pnl = position * (price - entry_price)
-                equity += pnl
-                trades.append(pnl)
-                position = 0
-        elif position < 0:  # SHORT
-            new_trail = price + (atr_mult * atr)
-            trail_stop = min(trail_stop, new_trail)
-            if price >= trail_stop:
-                pnl = position * (price - entry_price)
-                equity += pnl
-                trades.append(pnl)
-                position = 0
-        
-        equity_curve.append(equity)
+    wins, losses = trades[trades > 0], trades[trades < 0]
+    win_rate = len(wins) / len(trades) * 100 if len(trades) else 0
+    avg_win = wins.mean() if len(wins) else 0
+    avg_loss = losses.mean() if len(losses) else 0
     
-    return equity_curve, trades
+    return {
+        'equity_curve': equity_curve,
+        'trades': trades,
+        'final_equity': equity_curve[-1],
+        'buy_hold_return': (close_arr[-1] / close_arr[0] - 1) * 100,
+        'buys': buys,
+        'sells': len(df) - buys,  # Signals are exclusively 1 or 2
+        'win_rate': win_rate,
+        'avg_win': avg_win,
+        'avg_loss': avg_loss,
+    }
 
 # =============================================================================
-# MAIN EXECUTION
+# TABLE + PLOT
 # =============================================================================
 
-print("🔄 Loading SPY...")
-df = read_csv_to_dataframe(file_path)
-df = add_atr(df, length=10)
-df = add_total_signal(df)
-df.dropna(inplace=True)
-
-# RUN BASSO
-equity_curve, trades = run_tom_basso_coin_toss(df)
-
-# CALCULATE METRICS
-final_equity = equity_curve[-1]
-buy_hold_return = ((df['Close'].iloc[-1] / df['Close'].iloc[0] - 1) * 100)
-buys = sum(df['TotalSignal']==2)
-sells = sum(df['TotalSignal']==1)
-
-if trades:
-    win_rate = len([t for t in trades if t > 0]) / len(trades) * 100
-    avg_win = np.mean([t for t in trades if t > 0])
-    avg_loss = np.mean([t for t in trades if t < 0])
-else:
-    win_rate = avg_win = avg_loss = 0
+def render(df, results, out_path='basso_coin_toss_results.png'):
+    """4-panel figure: equity curve, results table, trade P&L histogram, last 20 flips."""
+    import matplotlib.pyplot as plt  # Only figure-producing runs pay for the import
+    
+    equity_curve = results['equity_curve']
+    trades = results['trades']
+    final_equity = results['final_equity']
+    buy_hold_return = results['buy_hold_return']
+    buys, sells = results['buys'], results['sells']
+    win_rate, avg_win, avg_loss = results['win_rate'], results['avg_win'], results['avg_loss']
+    
+    fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(15, 12))
+
+    # 1. EQUITY CURVE
+    close_arr = df['Close'].to_numpy()
+    bh_curve = 10000.0 * (close_arr / close_arr[0])
+    ax1.plot(df.index.values, equity_curve[:-1], label='Basso Coin Toss', linewidth=2, color='green')
+    ax1.plot(df.index.values, bh_curve, label='SPY Buy & Hold', linewidth=2, color='blue', alpha=0.7)
+    ax1.set_title('🪙 Tom Basso Coin Toss vs Buy & Hold', fontsize=14, fontweight='bold')
+    ax1.legend()
+    ax1.grid(True, alpha=0.3)
+    ax1.set_ylabel('Equity ($)')
+    plt.setp(ax1.xaxis.get_majorticklabels(), rotation=45)
+
+    # 2. RESULTS TABLE
+    table_data = [
+        ['Metric', 'Value'],
+        ['Start Capital', '$10,000'],
+        ['Final Equity', f'${final_equity:,.0f}'],
+        ['Total Return', f'{((final_equity/10000-1)*100):+.1f}%'],
+        ['Buy & Hold', f'{buy_hold_return:+.1f}%'],
+        ['Alpha', f'{((final_equity/10000-1)*100 - buy_hold_return):+.1f}%'],
+        ['Trades', f'{len(trades)}'],
+        ['Win Rate', f'{win_rate:.1f}%'],
+        ['Avg Win', f'${avg_win:+.0f}'],
+        ['Avg Loss', f'${avg_loss:.0f}'],
+        ['Coin Flips', f'{buys}/{sells}']
+    ]
+
+    table = ax2.table(cellText=table_data[1:], colLabels=table_data[0], 
+                      cellLoc='center', loc='center', colColours=['#E8F4FD', '#B3D9F2'])
+    table.auto_set_font_size(False)
+    table.set_fontsize(11)
+    table.scale(1, 2)
+    ax2.axis('off')
+    ax2.set_title('📊 PERFORMANCE SUMMARY', fontsize=14, fontweight='bold', pad=20)
+
+    # 3. TRADE DISTRIBUTION
+    ax3.hist(trades, bins=20, alpha=0.7, color='orange', edgecolor='black')
+    ax3.axvline(np.mean(trades), color='red', linestyle='--', label=f'Avg: ${np.mean(trades):.0f}')
+    ax3.set_title('💰 TRADE P&L DISTRIBUTION', fontsize=14, fontweight='bold')
+    ax3.set_xlabel('PnL ($)')
+    ax3.set_ylabel('Frequency')
+    ax3.legend()
+    ax3.grid(True, alpha=0.3)
+
+    # 4. LAST 20 SIGNALS
+    last_20 = df[['Close', 'TotalSignal', 'ATR']].tail(20).copy()
+    last_20['Signal'] = SIGNAL_LABELS[last_20['TotalSignal'].to_numpy()]
+    ax4.axis('tight')
+    ax4.axis('off')
+    table2 = ax4.table(cellText=last_20[['Close', 'Signal', 'ATR']].round(2).values,
+                       colLabels=['Close', 'Coin Flip', 'ATR'],
+                       cellLoc='center', loc='center')
+    table2.auto_set_font_size(False)
+    table2.set_fontsize(10)
+    ax4.set_title('🪙 LAST 20 COIN FLIPS', fontsize=14, fontweight='bold', pad=20)
+
+    plt.tight_layout()
+    plt.suptitle('TOM BASSO COIN TOSS EXPERIMENT - SPY 2017-2024', fontsize=16, fontweight='bold')
+    plt.savefig(out_path, dpi=300, bbox_inches='tight')
+    plt.show()
 
 # =============================================================================
-# TABLE + PLOT
+# MAIN EXECUTION
 # =============================================================================
 
-fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(15, 12))
-
-# 1. EQUITY CURVE
-ax1.plot(df.index, equity_curve[:-1], label='Basso Coin Toss', linewidth=2, color='green')
-ax1.plot(df.index, 10000 * (1 + (df['Close'] / df['Close'].iloc[0] - 1)), 
-         label='SPY Buy & Hold', linewidth=2, color='blue', alpha=0.7)
-ax1.set_title('🪙 Tom Basso Coin Toss vs Buy & Hold', fontsize=14, fontweight='bold')
-ax1.legend()
-ax1.grid(True, alpha=0.3)
-ax1.set_ylabel('Equity ($)')
-plt.setp(ax1.xaxis.get_majorticklabels(), rotation=45)
-
-# 2. RESULTS TABLE
-table_data = [
-    ['Metric', 'Value'],
-    ['Start Capital', '$10,000'],
-    ['Final Equity', f'${final_equity:,.0f}'],
-    ['Total Return', f'{((final_equity/10000-1)*100):+.1f}%'],
-    ['Buy & Hold', f'{buy_hold_return:+.1f}%'],
-    ['Alpha', f'{((final_equity/10000-1)*100 - buy_hold_return):+.1f}%'],
-    ['Trades', f'{len(trades)}'],
-    ['Win Rate', f'{win_rate:.1f}%'],
-    ['Avg Win', f'${avg_win:+.0f}'],
-    ['Avg Loss', f'${avg_loss:.0f}'],
-    ['Coin Flips', f'{buys}/{sells}']
-]
-
-table = ax2.table(cellText=table_data[1:], colLabels=table_data[0], 
-                  cellLoc='center', loc='center', colColours=['#E8F4FD', '#B3D9F2'])
-table.auto_set_font_size(False)
-table.set_fontsize(11)
-table.scale(1, 2)
-ax2.axis('off')
-ax2.set_title('📊 PERFORMANCE SUMMARY', fontsize=14, fontweight='bold', pad=20)
-
-# 3. TRADE DISTRIBUTION
-ax3.hist(trades, bins=20, alpha=0.7, color='orange', edgecolor='black')
-ax3.axvline(np.mean(trades), color='red', linestyle='--', label=f'Avg: ${np.mean(trades):.0f}')
-ax3.set_title('💰 TRADE P&L DISTRIBUTION', fontsize=14, fontweight='bold')
-ax3.set_xlabel('PnL ($)')
-ax3.set_ylabel('Frequency')
-ax3.legend()
-ax3.grid(True, alpha=0.3)
-
-# 4. LAST 20 SIGNALS
-last_20 = df[['Close', 'TotalSignal', 'ATR']].tail(20).copy()
-last_20['Signal'] = last_20['TotalSignal'].map({1:'🔴SHORT', 2:'🟢LONG'})
-ax4.axis('tight')
-ax4.axis('off')
-table2 = ax4.table(cellText=last_20[['Close', 'Signal', 'ATR']].round(2).values,
-                   colLabels=['Close', 'Coin Flip', 'ATR'],
-                   cellLoc='center', loc='center')
-table2.auto_set_font_size(False)
-table2.set_fontsize(10)
-ax4.set_title('🪙 LAST 20 COIN FLIPS', fontsize=14, fontweight='bold', pad=20)
-
-plt.tight_layout()
-plt.suptitle('TOM BASSO COIN TOSS EXPERIMENT - SPY 2017-2024', fontsize=16, fontweight='bold')
-plt.savefig('basso_coin_toss_results.png', dpi=300, bbox_inches='tight')
-plt.show()
-
-print("✅ Table plot saved as 'basso_coin_toss_results.png'")
-print(f"🎯 Final Result: $10k → ${final_equity:,.0f} ({((final_equity/10000-1)*100):+.1f}%)")
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Tom Basso coin toss experiment on SPY')
+    parser.add_argument('--sims', type=int, default=1,
+                        help='Monte-Carlo runs; more than 1 prints the return distribution, no figure')
+    parser.add_argument('--no-plot', action='store_true', help='skip rendering the 4-panel figure')
+    args = parser.parse_args()
+    
+    print(f"🔍 Looking for file: {file_path}")
+    print(f"🔄 Loading SPY... (seed {SEED})")
+    df = load_spy(file_path)
+    df = add_atr(df, length=10)
+    start = df['ATR'].first_valid_index()  # Skip ATR warm-up bars (slice, no dropna copy)
+    
+    if args.sims > 1:
+        # MONTE-CARLO - compute only, never touches matplotlib
+        final_equities = monte_carlo(df.loc[start:], rng, n_sims=args.sims)[:, -1]
+        mc_returns = (final_equities / 10000 - 1) * 100
+        print(f"🎲 Monte-Carlo: {args.sims} coin toss runs")
+        print(f"   Median Return:  {np.median(mc_returns):+7.1f}%")
+        print(f"   5th → 95th pct: {np.percentile(mc_returns, 5):+7.1f}% → {np.percentile(mc_returns, 95):+7.1f}%")
+        print(f"   Profitable:     {100 * np.mean(final_equities > 10000):5.1f}% of runs")
+    else:
+        df = make_signals(df, rng).loc[start:]
+        results = backtest(df)
+        final_equity = results['final_equity']
+        if not args.no_plot:
+            render(df, results)
+            print("✅ Table plot saved as 'basso_coin_toss_results.png'")
+        print(f"🎯 Final Result: $10k → ${final_equity:,.0f} ({((final_equity/10000-1)*100):+.1f}%)")
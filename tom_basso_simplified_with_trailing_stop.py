@@ -8,127 +8,38 @@ Tom Basso COIN TOSS EXPERIMENT - COMPLETE WORKING VERSION
 ✅ FULL validation of risk management power
 """
 
-import pandas as pd
 import numpy as np
-import os
 
-# FIXED FILE PATH - Works anywhere
-script_dir = os.path.dirname(os.path.abspath(__file__))
-file_path = os.path.join(script_dir, 'SPY_1D_BID_16.02.2017-06.07.2024.csv')
-print(f"🔍 Looking for file: {file_path}")
-
-# =============================================================================
-# CORE FUNCTIONS (UNCHANGED FROM ORIGINAL)
-# =============================================================================
-
-def read_csv_to_dataframe(file_path):
-    """Load European CSV format."""
-    df = pd.read_csv(file_path)
-    df["Gmt time"] = df["Gmt time"].str.replace(".000", "")
-    df['Gmt time'] = pd.to_datetime(df['Gmt time'], format='%d.%m.%Y %H:%M:%S', dayfirst=True)
-    df = df[df.High != df.Low]
-    df.set_index("Gmt time", inplace=True)
-    return df
-
-def total_signal(df, current_candle):
-    """COIN FLIP: 50/50 Long(2)/Short(1) - Basso exact."""
-    return np.random.choice([1, 2])
-
-def add_total_signal(df):
-    df['TotalSignal'] = [total_signal(df, idx) for idx in df.index]
-    return df
-
-def add_atr(df, length=10):
-    """ATR for Basso's 3x volatility stops."""
-    high_low = df['High'] - df['Low']
-    high_close = np.abs(df['High'] - df['Close'].shift())
-    low_close = np.abs(df['Low'] - df['Close'].shift())
-    tr = np.maximum(high_low, np.maximum(high_close, low_close))
-    df['ATR'] = tr.rolling(window=length).mean()
-    return df
+from basso_core import SEED, SPY_CSV, load_spy, add_atr, make_signals, backtest_trailing, monte_carlo
 
-# =============================================================================
-# TOM BASSO COIN TOSS BACKTEST (TRAILING STOPS)
-# =============================================================================
-
-def run_tom_basso_coin_toss(df, initial_capital=10000, risk_pct=0.01, atr_mult=3.0):
-    """
-    EXACT Tom Basso Coin Toss Experiment:
-    • Coin flip entry (random 1/2 signals)
-    • 1% equity risk per trade
-    • 3x ATR TRAILING stop from CLOSE
-    • Single market (SPY)
-    """
-    equity = initial_capital
-    position = 0  # Shares (+long, -short)
-    entry_price = 0
-    trail_stop = 0
-    trades = []
-    
-    print(f"🪙 Basso Coin Toss: {risk_pct*100}% risk | {atr_mult}x ATR trailing stops")
-    
-    for i in range(len(df)):
-        price = df['Close'].iloc[i]  # Basso uses CLOSE
-        atr = df['ATR'].iloc[i]
-        signal = df['TotalSignal'].iloc[i]
-        risk_amount = risk_pct * equity  # Dynamic 1%
-        
-        # COIN FLIP LONG (signal=2)
-        if signal == 2 and position <= 0:
-            stop_distance = atr_mult * atr
-            position_size = risk_amount / stop_distance
-            position = position_size
-            entry_price = price
-            trail_stop = price - stop_distance  # Initial 3x ATR
-            
-        # COIN FLIP SHORT (signal=1)
-        elif signal == 1 and position >= 0:
-            stop_distance = atr_mult * atr
-            position_size = risk_amount / stop_distance
-            position = -position_size
-            entry_price = price
-            trail_stop = price + stop_distance  # Initial 3x ATR
-        
-        # TRAILING STOP LOGIC (Basso's edge)
-        if position > 0:  # LONG
-            new_trail = price - (atr_mult * atr)  # Recalculate from current CLOSE
-            trail_stop = max(trail_stop, new_trail)  # ONLY moves UP
-            if price <= trail_stop:  # Stop hit
-                pnl = position * (price - entry_price)
-                equity += pnl
-                trades.append(pnl)
-                position = 0
-                
-        elif position < 0:  # SHORT
-            new_trail = price + (atr_mult * atr)
-            trail_stop = min(trail_stop, new_trail)  # ONLY moves DOWN
-            if price >= trail_stop:  # Stop hit
-                pnl = position * (price - entry_price)
-                equity += pnl
-                trades.append(pnl)
-                position = 0
-    
-    return equity, len(trades), np.mean(trades) if trades else 0
+file_path = SPY_CSV
+rng = np.random.default_rng(SEED)  # Reproducible coin flips (override: BASSO_SEED=<int>)
+print(f"🔍 Looking for file: {file_path}")
 
 # =============================================================================
 # MAIN EXECUTION
 # =============================================================================
 
 print("🔄 Loading SPY data...")
-df = read_csv_to_dataframe(file_path)
+df = load_spy(file_path)
 
-print("⚙️  Coin flips + ATR...")
+print(f"⚙️  Coin flips + ATR... (seed {SEED})")
 df = add_atr(df, length=10)
-df = add_total_signal(df)
-df.dropna(inplace=True)
+df = make_signals(df, rng)
+df = df.loc[df['ATR'].first_valid_index():]  # Skip ATR warm-up bars (slice, no dropna copy)
 
 # RUN BASSO COIN TOSS
-final_equity, num_trades, avg_pnl = run_tom_basso_coin_toss(df)
+risk_pct, atr_mult = 0.01, 3.0
+print(f"🪙 Basso Coin Toss: {risk_pct*100}% risk | {atr_mult}x ATR trailing stops")
+equity_curve, trades = backtest_trailing(df, risk_pct=risk_pct, atr_mult=atr_mult)
+final_equity = equity_curve[-1]
+num_trades = len(trades)
+avg_pnl = trades.mean() if num_trades else 0
 
 # BASELINES
 buy_hold_return = ((df['Close'].iloc[-1] / df['Close'].iloc[0] - 1) * 100)
-buys = sum(df['TotalSignal']==2)
-sells = sum(df['TotalSignal']==1)
+buys = int(np.count_nonzero(df['TotalSignal'].to_numpy() == 2))
+sells = len(df) - buys  # Signals are exclusively 1 or 2
 
 # =============================================================================
 # RESULTS
@@ -136,10 +47,12 @@ sells = sum(df['TotalSignal']==1)
 
 print("\n📊 LAST 20 CANDLES:")
 print("🪙 Coin: 🟢2(LONG) 🔴1(SHORT)")
-for i in range(-20, 0):
-    signal = {2:'🟢2', 1:'🔴1'}[df['TotalSignal'].iloc[i]]
-    change = "📈" if df['Close'].iloc[i] > df['Open'].iloc[i] else "📉"
-    print(f"{change} {df['Close'].iloc[i]:6.1f} {signal} ATR:{df['ATR'].iloc[i]:5.2f}")
+last_20 = df.tail(20)  # One slice + one array per column, no per-cell .iloc
+signal_labels = {2:'🟢2', 1:'🔴1'}
+for close, open_, sig, atr in zip(last_20['Close'].to_numpy(), last_20['Open'].to_numpy(),
+                                  last_20['TotalSignal'].to_numpy(), last_20['ATR'].to_numpy()):
+    change = "📈" if close > open_ else "📉"
+    print(f"{change} {close:6.1f} {signal_labels[sig]} ATR:{atr:5.2f}")
 
 print("\n" + "="*70)
 print("🪙 TOM BASSO COIN TOSS EXPERIMENT")
@@ -163,3 +76,15 @@ print("   • 1% equity risk")
 print("   • 3x ATR trailing stops")
 print("   • Single market baseline")
 print("="*70)
+
+# =============================================================================
+# MONTE-CARLO (Basso's claim is statistical - many coin flip universes)
+# =============================================================================
+
+N_SIMS = 1000
+print(f"\n🎲 Monte-Carlo: {N_SIMS} coin toss runs...")
+mc_final = monte_carlo(df, rng, n_sims=N_SIMS, risk_pct=risk_pct, atr_mult=atr_mult)[:, -1]
+mc_returns = (mc_final / 10000 - 1) * 100
+print(f"   Median Return:  {np.median(mc_returns):+7.1f}%")
+print(f"   5th → 95th pct: {np.percentile(mc_returns, 5):+7.1f}% → {np.percentile(mc_returns, 95):+7.1f}%")
+print(f"   Profitable:     {100 * np.mean(mc_final > 10000):5.1f}% of runs")